@@ -1,449 +1,1065 @@
-import os
-import asyncio
-from uuid import UUID, uuid4
-from typing import List, Optional, Dict, Any
-
-import pymysql
-from fastapi import (
-    FastAPI,
-    HTTPException,
-    Query,
-    BackgroundTasks,
-    status,
-    Response,
-    Request
-)
-from fastapi.responses import JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime
-
-from models.user import UserRead, UserCreate, UserUpdate
-from models.address import Address, AddressCreate, AddressUpdate
-
-port = int(os.environ.get("FASTAPIPORT", 8000))
-
-app = FastAPI(
-    title="User Service",
-    version="0.2.0",
-    description="User & Address microservice."
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-def get_connection():
-    return pymysql.connect(
-        host=os.getenv("MYSQL_HOST", "10.128.0.3"),
-        port=int(os.getenv("MYSQL_PORT", "3306")),
-        user=os.getenv("MYSQL_USER", "user_microservice"),
-        password=os.getenv("MYSQL_PASSWORD", "root1234"),
-        database=os.getenv("MYSQL_DB", "userservice"),
-        cursorclass=pymysql.cursors.DictCursor,
-        autocommit=True,
-    )
-
-def row_to_user(row: Dict[str, Any]) -> UserRead:
-    return UserRead(
-        id=UUID(row["id"]),
-        email=row["email"],
-        username=row["username"],
-        full_name=row["full_name"],
-        avatar_url=row["avatar_url"],
-        phone=row["phone"],
-        role=row["role"],
-        created_at=row["created_at"],
-        updated_at=row["updated_at"]
-    )
-
-def row_to_address(row: Dict[str, Any]) -> Address:
-    return Address(
-        id=UUID(row["id"]),
-        user_id=UUID(row["user_id"]),
-        country=row["country"],
-        city=row["city"],
-        street=row["street"],
-        postal_code=row["postal_code"]
-    )
-
-def fetch_user_by_id(user_id: UUID) -> UserRead:
-    conn = get_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT * FROM users WHERE id = %s", (str(user_id),))
-            row = cur.fetchone()
-            if not row:
-                raise HTTPException(status_code=404, detail="User not found")
-            return row_to_user(row)
-    finally:
-        conn.close()
-
-def fetch_address_by_id(address_id: UUID) -> Address:
-    conn = get_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT * FROM addresses WHERE id = %s", (str(address_id),))
-            row = cur.fetchone()
-            if not row:
-                raise HTTPException(status_code=404, detail="Address not found")
-            return row_to_address(row)
-    finally:
-        conn.close()
-
-def make_user_etag(user) -> str:
-    ts = int(user.updated_at.timestamp() if isinstance(user.updated_at, datetime)
-             else datetime.fromisoformat(str(user.updated_at)).timestamp())
-    return f'W/"user-{user.id}-{ts}"'
-
-def user_link_headers(user_id) -> dict[str, str]:
-    return {
-        "Link": (
-            f'</users/{user_id}>; rel="self", '
-            f'</users>; rel="collection", '
-            f'</addresses?user_id={user_id}>; rel="addresses"'
-        )
-    }
-
-@app.get("/users", response_model=List[UserRead], tags=["users"])
-def list_users(
-    email: Optional[str] = Query(None),
-    username: Optional[str] = Query(None),
-    limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0)
-):
-    conn = get_connection()
-    try:
-        sql = "SELECT * FROM users WHERE 1=1"
-        params: list[Any] = []
-
-        if email:
-            sql += " AND email = %s"
-            params.append(email)
-        if username:
-            sql += " AND username LIKE %s"
-            params.append(f"%{username}%")
-
-        sql += " ORDER BY created_at DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
-
-        with conn.cursor() as cur:
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-
-        return [row_to_user(r) for r in rows]
-    finally:
-        conn.close()
-
-@app.get("/users/by_email/{email}", response_model=UserRead, tags=["users"])
-def get_user_by_email(email: str):
-    conn = get_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT * FROM users WHERE email = %s", (email,))
-            row = cur.fetchone()
-            if not row:
-                raise HTTPException(status_code=404, detail="User not found")
-            return row_to_user(row)
-    finally:
-        conn.close()
-
-@app.post(
-    "/users",
-    response_model=UserRead,
-    status_code=status.HTTP_201_CREATED,
-    tags=["users"]
-)
-def create_user(payload: UserCreate, response: Response):
-    user_id = uuid4()
-    conn = get_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT * FROM users WHERE email = %s", (payload.email,))
-            existing_user = cur.fetchone()
-
-            if existing_user:
-                response.status_code = status.HTTP_200_OK
-                response.headers["Location"] = f"/users/{existing_user['id']}"
-                return row_to_user(existing_user)
-
-            cur.execute(
-                """
-                INSERT INTO users
-                    (id, email, username, full_name, avatar_url, phone, role)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    str(user_id),
-                    payload.email,
-                    payload.username,
-                    payload.full_name,
-                    str(payload.avatar_url) if payload.avatar_url else None,
-                    payload.phone,
-                    payload.role
-                )
-            )
-    finally:
-        conn.close()
-
-    user = fetch_user_by_id(user_id)
-    response.headers["Location"] = f"/users/{user_id}"
-    return user
-
-@app.get("/users/{user_id}", response_model=UserRead, tags=["users"])
-def get_user(user_id: UUID, request: Request, response: Response):
-    user = fetch_user_by_id(user_id)
-    etag = make_user_etag(user)
-
-    if request.headers.get("if-none-match") == etag:
-        return Response(status_code=304, headers={"ETag": etag, **user_link_headers(user_id)})
-
-    response.headers["ETag"] = etag
-    response.headers.update(user_link_headers(user_id))
-    return user
-
-@app.put("/users/{user_id}", response_model=UserRead, tags=["users"])
-def replace_user(user_id: UUID, payload: UserUpdate, request: Request, response: Response):
-    current = fetch_user_by_id(user_id)
-    current_etag = make_user_etag(current)
-
-    if_match = request.headers.get("if-match")
-    if if_match and if_match != current_etag:
-        raise HTTPException(status_code=412, detail="Precondition Failed (ETag mismatch)")
-
-    conn = get_connection()
-    try:
-        fields = []
-        params: list[Any] = []
-
-        if payload.username is not None:
-            fields.append("username = %s")
-            params.append(payload.username)
-        if payload.full_name is not None:
-            fields.append("full_name = %s")
-            params.append(payload.full_name)
-        if payload.avatar_url is not None:
-            fields.append("avatar_url = %s")
-            params.append(str(payload.avatar_url))
-        if payload.phone is not None:
-            fields.append("phone = %s")
-            params.append(payload.phone)
-        if payload.role is not None:
-            fields.append("role = %s")
-            params.append(payload.role)
-
-        if not fields:
-            response.headers["ETag"] = current_etag
-            response.headers.update(user_link_headers(user_id))
-            return current
-
-        sql = "UPDATE users SET " + ", ".join(fields) + " WHERE id = %s"
-        params.append(str(user_id))
-
-        with conn.cursor() as cur:
-            cur.execute(sql, params)
-            if cur.rowcount == 0:
-                raise HTTPException(status_code=404, detail="User not found")
-        conn.commit()
-    finally:
-        conn.close()
-
-    updated = fetch_user_by_id(user_id)
-    new_etag = make_user_etag(updated)
-    response.headers["ETag"] = new_etag
-    response.headers.update(user_link_headers(user_id))
-    return updated
-
-@app.delete(
-    "/users/{user_id}",
-    status_code=status.HTTP_204_NO_CONTENT,
-    tags=["users"]
-)
-def delete_user(user_id: UUID):
-    conn = get_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("DELETE FROM users WHERE id = %s", (str(user_id),))
-            if cur.rowcount == 0:
-                raise HTTPException(status_code=404, detail="User not found")
-    finally:
-        conn.close()
-
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
-
-@app.get("/addresses", response_model=List[Address], tags=["addresses"])
-def list_addresses(
-    user_id: Optional[UUID] = Query(None),
-    city: Optional[str] = Query(None),
-    postal_code: Optional[str] = Query(None),
-    limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-):
-    conn = get_connection()
-    try:
-        sql = "SELECT * FROM addresses WHERE 1=1"
-        params: list[Any] = []
-
-        if user_id:
-            sql += " AND user_id = %s"
-            params.append(str(user_id))
-        if city:
-            sql += " AND city LIKE %s"
-            params.append(f"%{city}%")
-        if postal_code:
-            sql += " AND postal_code = %s"
-            params.append(postal_code)
-
-        sql += " ORDER BY created_at DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
-
-        with conn.cursor() as cur:
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-
-        return [row_to_address(r) for r in rows]
-    finally:
-        conn.close()
-
-@app.post(
-    "/addresses",
-    response_model=Address,
-    status_code=status.HTTP_201_CREATED,
-    tags=["addresses"]
-)
-def create_address(payload: AddressCreate, response: Response):
-    addr_id = uuid4()
-
-    conn = get_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO addresses
-                  (id, user_id, country, city, street, postal_code)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    str(addr_id),
-                    str(payload.user_id),
-                    payload.country,
-                    payload.city,
-                    payload.street,
-                    payload.postal_code
-                )
-            )
-    finally:
-        conn.close()
-
-    addr = fetch_address_by_id(addr_id)
-    response.headers["Location"] = f"/addresses/{addr_id}"
-    return addr
-
-@app.get("/addresses/{address_id}", response_model=Address, tags=["addresses"])
-def get_address(address_id: UUID, response: Response):
-    addr = fetch_address_by_id(address_id)
-    response.headers["Link"] = (
-        f'</addresses/{address_id}>; rel="self", '
-        f'</addresses>; rel="collection", '
-        f'</users/{addr.user_id}>; rel="user"'
-    )
-    return addr
-
-@app.put("/addresses/{address_id}", response_model=Address, tags=["addresses"])
-def replace_address(address_id: UUID, payload: AddressUpdate):
-    conn = get_connection()
-    try:
-        fields = []
-        params: list[Any] = []
-
-        if payload.country is not None:
-            fields.append("country = %s")
-            params.append(payload.country)
-        if payload.city is not None:
-            fields.append("city = %s")
-            params.append(payload.city)
-        if payload.street is not None:
-            fields.append("street = %s")
-            params.append(payload.street)
-        if payload.postal_code is not None:
-            fields.append("postal_code = %s")
-            params.append(payload.postal_code)
-
-        if not fields:
-            return fetch_address_by_id(address_id)
-
-        sql = "UPDATE addresses SET " + ", ".join(fields) + " WHERE id = %s"
-        params.append(str(address_id))
-
-        with conn.cursor() as cur:
-            cur.execute(sql, params)
-            if cur.rowcount == 0:
-                raise HTTPException(status_code=404, detail="Address not found")
-    finally:
-        conn.close()
-
-    return fetch_address_by_id(address_id)
-
-@app.delete(
-    "/addresses/{address_id}",
-    status_code=status.HTTP_204_NO_CONTENT,
-    tags=["addresses"]
-)
-def delete_address(address_id: UUID):
-    conn = get_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("DELETE FROM addresses WHERE id = %s", (str(address_id),))
-            if cur.rowcount == 0:
-                raise HTTPException(status_code=404, detail="Address not found")
-    finally:
-        conn.close()
-
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
-
-jobs: Dict[str, Dict[str, Any]] = {}
-
-async def run_export_job(job_id: str, user_id: UUID):
-    jobs[job_id]["status"] = "running"
-    await asyncio.sleep(5)
-    jobs[job_id]["status"] = "completed"
-    jobs[job_id]["result"] = {"user_export_url": f"/users/{user_id}"}
-
-@app.post(
-    "/users/{user_id}/export",
-    status_code=status.HTTP_202_ACCEPTED,
-    tags=["users"]
-)
-async def start_export_user(
-    user_id: UUID,
-    background_tasks: BackgroundTasks
-):
-    fetch_user_by_id(user_id)
-
-    job_id = str(uuid4())
-    jobs[job_id] = {"status": "pending"}
-    background_tasks.add_task(run_export_job, job_id, user_id)
-
-    return JSONResponse(
-        status_code=status.HTTP_202_ACCEPTED,
-        content={"job_id": job_id, "status": "pending"},
-        headers={"Location": f"/jobs/{job_id}"}
-    )
-
-@app.get("/jobs/{job_id}", tags=["jobs"])
-def get_job_status(job_id: str):
-    job = jobs.get(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    return job
-
-@app.get("/")
-def root():
-    return {"message": "Welcome to the User/Address API."}
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
+import os
+import json
+import asyncio
+
+import orjson
+from functools import lru_cache
+from uuid import UUID, uuid4
+from typing import List, Optional, Dict, Any
+
+try:
+    # C-accelerated driver (libmysqlclient): decodes result packets in C,
+    # typically 3-5x faster on row-heavy list queries.
+    import MySQLdb as mysql_driver
+except ImportError:
+    # Pure-Python fallback; same DB-API surface.
+    import pymysql as mysql_driver
+
+import redis.asyncio as aioredis
+from dbutils.pooled_db import PooledDB
+from fastapi import (
+    FastAPI,
+    HTTPException,
+    Query,
+    BackgroundTasks,
+    status,
+    Response,
+    Request
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from fastapi.middleware.cors import CORSMiddleware
+from datetime import datetime, timezone
+
+from collections import defaultdict
+
+from pydantic import ValidationError
+
+from models.user import UserRead, UserReadFast, UserCreate, UserUpdate, UserWithAddresses
+from models.adapters import USER_CREATE_LIST
+from models.address import Address, AddressCreate, AddressUpdate
+from models.structs import (
+    JSON_ENCODER,
+    AddressStruct,
+    UserReadStruct,
+    row_to_address_struct,
+    row_to_user_struct,
+)
+
+port = int(os.environ.get("FASTAPIPORT", 8000))
+
+app = FastAPI(
+    title="User Service",
+    version="0.2.0",
+    description="User & Address microservice.",
+    default_response_class=ORJSONResponse
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+POOL_MIN_CACHED = int(os.environ.get("MYSQL_POOL_MIN", 5))
+POOL_MAX_CACHED = int(os.environ.get("MYSQL_POOL_MAX", 20))
+POOL_MAX_CONNECTIONS = int(os.environ.get("MYSQL_POOL_LIMIT", 50))
+
+# Writes go to the primary; reads can go to a replica (MYSQL_RO_HOST,
+# defaulting to the primary so single-node setups need no config).
+_write_pool: Optional[PooledDB] = None
+_read_pool: Optional[PooledDB] = None
+
+def _build_pool(host: str) -> PooledDB:
+    return PooledDB(
+        creator=mysql_driver,
+        mincached=POOL_MIN_CACHED,
+        maxcached=POOL_MAX_CACHED,
+        maxconnections=POOL_MAX_CONNECTIONS,
+        blocking=True,
+        ping=1,
+        host=host,
+        port=int(os.getenv("MYSQL_PORT", "3306")),
+        user=os.getenv("MYSQL_USER", "user_microservice"),
+        password=os.getenv("MYSQL_PASSWORD", "root1234"),
+        database=os.getenv("MYSQL_DB", "userservice"),
+        autocommit=True,
+    )
+
+def get_pool(readonly: bool = False) -> PooledDB:
+    global _write_pool, _read_pool
+    if readonly:
+        if _read_pool is None:
+            _read_pool = _build_pool(
+                os.getenv("MYSQL_RO_HOST", os.getenv("MYSQL_HOST", "10.128.0.3"))
+            )
+        return _read_pool
+    if _write_pool is None:
+        _write_pool = _build_pool(os.getenv("MYSQL_HOST", "10.128.0.3"))
+    return _write_pool
+
+def get_connection(readonly: bool = False):
+    # close() on the returned proxy releases the connection back to the pool.
+    return get_pool(readonly).connection()
+
+def _ping_connection(readonly: bool):
+    conn = get_connection(readonly)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+    finally:
+        conn.close()
+
+@app.on_event("startup")
+async def warm_pool():
+    # The update models defer their schema build out of the import path;
+    # finish them here so PUT traffic doesn't pay it on the first request.
+    # UserBrief stays lazy — most replicas never instantiate it.
+    for model in (UserUpdate, AddressUpdate):
+        model.model_rebuild()
+    # Pre-open the cached connections in parallel so the first real
+    # requests don't each pay a full MySQL handshake.
+    await asyncio.gather(
+        *[asyncio.to_thread(_ping_connection, readonly)
+          for readonly in (False, True)
+          for _ in range(POOL_MIN_CACHED)]
+    )
+
+@app.on_event("shutdown")
+async def close_pool():
+    for pool in (_write_pool, _read_pool):
+        if pool is not None:
+            pool.close()
+    if _redis is not None:
+        await _redis.aclose()
+
+_redis: Optional[aioredis.Redis] = None
+
+def get_redis() -> aioredis.Redis:
+    global _redis
+    if _redis is None:
+        _redis = aioredis.Redis.from_url(
+            os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+            decode_responses=True,
+        )
+    return _redis
+
+# Point-read cache: "<etag>\n<json body>" per user/address, short TTL,
+# invalidated on PUT/DELETE. Cache errors degrade to a normal DB read so
+# the service keeps working without Redis.
+CACHE_TTL_SECONDS = 300
+
+def user_cache_key(user_id) -> str:
+    return f"user:{user_id}"
+
+def address_cache_key(address_id) -> str:
+    return f"address:{address_id}"
+
+async def cache_get(key: str) -> Optional[tuple[str, str]]:
+    try:
+        cached = await get_redis().get(key)
+    except (aioredis.RedisError, OSError):
+        return None
+    if cached is None:
+        return None
+    etag, _, body = cached.partition("\n")
+    return etag, body
+
+async def cache_set(key: str, etag: str, body: str):
+    try:
+        await get_redis().setex(key, CACHE_TTL_SECONDS, f"{etag}\n{body}")
+    except (aioredis.RedisError, OSError):
+        pass
+
+async def cache_delete(key: str):
+    try:
+        await get_redis().delete(key)
+    except (aioredis.RedisError, OSError):
+        pass
+
+# Explicit column lists keep SELECTs aligned with what the row_to_* helpers
+# consume and give MySQL a shot at covering indexes.
+_USER_COLS = "id, email, username, full_name, avatar_url, phone, role, created_at, updated_at"
+_ADDR_COLS = "id, user_id, country, city, street, postal_code"
+
+# Rows come straight from our own schema with the right types, so the
+# converters use model_construct and skip pydantic validation per row.
+# They unpack tuple rows positionally in _USER_COLS / _ADDR_COLS order:
+# the default cursor skips DictCursor's per-row dict allocation.
+def row_to_user(row: tuple) -> UserRead:
+    return UserRead.model_construct(
+        id=UUID(bytes=row[0]),
+        email=row[1],
+        username=row[2],
+        full_name=row[3],
+        avatar_url=row[4],
+        phone=row[5],
+        role=row[6],
+        created_at=row[7],
+        updated_at=row[8]
+    )
+
+def row_to_address(row: tuple) -> Address:
+    return Address.model_construct(
+        id=UUID(bytes=row[0]),
+        user_id=UUID(bytes=row[1]),
+        country=row[2],
+        city=row[3],
+        street=row[4],
+        postal_code=row[5]
+    )
+
+# Precomputed key tuples: list responses are emitted straight from row
+# tuples via orjson (which encodes UUID/datetime natively), skipping
+# model construction entirely. The response_model declarations on the
+# list routes stay purely for OpenAPI docs.
+_USER_READ_KEYS = (
+    "id", "email", "username", "full_name", "avatar_url", "phone",
+    "role", "created_at", "updated_at"
+)
+_ADDR_KEYS = ("id", "user_id", "country", "city", "street", "postal_code")
+
+def user_row_to_dict(row: tuple, addresses: Optional[list] = None) -> dict:
+    d = dict(zip(_USER_READ_KEYS, row))
+    d["id"] = UUID(bytes=row[0])
+    if addresses is not None:
+        d["addresses"] = addresses
+    return d
+
+def addr_row_to_dict(row: tuple) -> dict:
+    d = dict(zip(_ADDR_KEYS, row))
+    d["id"] = UUID(bytes=row[0])
+    d["user_id"] = UUID(bytes=row[1])
+    return d
+
+def fetch_user_by_id(user_id: UUID, readonly: bool = True) -> UserRead:
+    conn = get_connection(readonly=readonly)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT {_USER_COLS} FROM users WHERE id = %s", (user_id.bytes,))
+            row = cur.fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail="User not found")
+            return row_to_user(row)
+    finally:
+        conn.close()
+
+def fetch_user_struct_by_id(user_id: UUID) -> UserReadStruct:
+    # Point-read variant of fetch_user_by_id returning the msgspec
+    # struct; used where the row goes straight to JSON.
+    conn = get_connection(readonly=True)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT {_USER_COLS} FROM users WHERE id = %s", (user_id.bytes,))
+            row = cur.fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail="User not found")
+            return row_to_user_struct(row)
+    finally:
+        conn.close()
+
+def fetch_address_by_id(address_id: UUID) -> Address:
+    conn = get_connection(readonly=True)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT {_ADDR_COLS} FROM addresses WHERE id = %s", (address_id.bytes,))
+            row = cur.fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail="Address not found")
+            return row_to_address(row)
+    finally:
+        conn.close()
+
+def make_user_etag(user) -> str:
+    ts = int(user.updated_at.timestamp() if isinstance(user.updated_at, datetime)
+             else datetime.fromisoformat(str(user.updated_at)).timestamp())
+    return f'W/"user-{user.id}-{ts}"'
+
+def make_address_etag(address_id, updated_at) -> str:
+    ts = int(updated_at.timestamp() if isinstance(updated_at, datetime)
+             else datetime.fromisoformat(str(updated_at)).timestamp())
+    return f'W/"address-{address_id}-{ts}"'
+
+def make_collection_etag(kind: str, max_updated_at, count: int) -> str:
+    ts = 0
+    if max_updated_at is not None:
+        ts = int(max_updated_at.timestamp() if isinstance(max_updated_at, datetime)
+                 else datetime.fromisoformat(str(max_updated_at)).timestamp())
+    return f'W/"{kind}-{ts}-{count}"'
+
+def user_link_headers(user_id) -> dict[str, str]:
+    return {
+        "Link": (
+            f'</users/{user_id}>; rel="self", '
+            f'</users>; rel="collection", '
+            f'</addresses?user_id={user_id}>; rel="addresses"'
+        )
+    }
+
+# SQL is assembled from a small set of filter/field combinations, so the
+# builders are lru_cached: each distinct shape is built (and interned)
+# once instead of being re-concatenated on every request.
+@lru_cache(maxsize=None)
+def _users_where(has_email: bool, has_username: bool) -> str:
+    where = " WHERE 1=1"
+    if has_email:
+        where += " AND email = %s"
+    if has_username:
+        where += " AND username LIKE %s"
+    return where
+
+@lru_cache(maxsize=None)
+def _users_agg_sql(has_email: bool, has_username: bool) -> str:
+    return "SELECT MAX(updated_at) mu, COUNT(*) c FROM users" + _users_where(has_email, has_username)
+
+@lru_cache(maxsize=None)
+def _list_users_sql(has_email: bool, has_username: bool, has_after: bool) -> str:
+    sql = f"SELECT {_USER_COLS} FROM users" + _users_where(has_email, has_username)
+    if has_after:
+        sql += " AND (created_at, id) < (%s, %s) ORDER BY created_at DESC, id DESC LIMIT %s"
+    else:
+        sql += " ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s"
+    return sql
+
+@lru_cache(maxsize=None)
+def _addresses_where(has_user_id: bool, has_city: bool, has_postal_code: bool) -> str:
+    where = " WHERE 1=1"
+    if has_user_id:
+        where += " AND user_id = %s"
+    if has_city:
+        where += " AND city LIKE %s"
+    if has_postal_code:
+        where += " AND postal_code = %s"
+    return where
+
+@lru_cache(maxsize=None)
+def _addresses_agg_sql(has_user_id: bool, has_city: bool, has_postal_code: bool) -> str:
+    return ("SELECT MAX(updated_at) mu, COUNT(*) c FROM addresses"
+            + _addresses_where(has_user_id, has_city, has_postal_code))
+
+@lru_cache(maxsize=None)
+def _list_addresses_sql(has_user_id: bool, has_city: bool, has_postal_code: bool, has_after: bool) -> str:
+    sql = (f"SELECT {_ADDR_COLS}, created_at FROM addresses"
+           + _addresses_where(has_user_id, has_city, has_postal_code))
+    if has_after:
+        sql += " AND (created_at, id) < (%s, %s) ORDER BY created_at DESC, id DESC LIMIT %s"
+    else:
+        sql += " ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s"
+    return sql
+
+@lru_cache(maxsize=64)
+def _user_update_sql(fields: tuple, has_if_match: bool) -> str:
+    sql = "UPDATE users SET " + ", ".join(f"{f} = %s" for f in fields) + " WHERE id = %s"
+    if has_if_match:
+        sql += " AND UNIX_TIMESTAMP(updated_at) = %s"
+    return sql
+
+@lru_cache(maxsize=16)
+def _address_update_sql(fields: tuple) -> str:
+    return "UPDATE addresses SET " + ", ".join(f"{f} = %s" for f in fields) + " WHERE id = %s"
+
+def parse_cursor(after: str) -> tuple[datetime, bytes]:
+    try:
+        ts, _, uid = after.rpartition(",")
+        return datetime.fromisoformat(ts), UUID(uid).bytes
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid 'after' cursor")
+
+def make_cursor(created_at: datetime, id_bytes: bytes) -> str:
+    return f"{created_at.isoformat()},{UUID(bytes=id_bytes)}"
+
+def _sync_list_users(
+    email: Optional[str],
+    username: Optional[str],
+    limit: int,
+    offset: int,
+    include: Optional[str],
+    after: Optional[str],
+    if_none_match: Optional[str]
+) -> tuple[Optional[List[dict]], Optional[str], str]:
+    conn = get_connection(readonly=True)
+    try:
+        filters: list[Any] = []
+        if email:
+            filters.append(email)
+        if username:
+            filters.append(f"%{username}%")
+
+        # Cheap aggregate first: if the collection hasn't changed since the
+        # client's last poll, skip the page query and serialization entirely.
+        with conn.cursor() as cur:
+            cur.execute(_users_agg_sql(bool(email), bool(username)), filters)
+            agg = cur.fetchone()
+        etag = make_collection_etag("users", agg[0], agg[1])
+        if if_none_match and if_none_match == etag:
+            return None, None, etag
+
+        params = list(filters)
+        if after:
+            # Keyset pagination: seek past the cursor row instead of
+            # scanning and discarding `offset` rows.
+            params.extend(parse_cursor(after))
+            params.append(limit)
+        else:
+            # Legacy offset pagination, kept for older clients.
+            params.extend([limit, offset])
+
+        with conn.cursor() as cur:
+            cur.execute(_list_users_sql(bool(email), bool(username), bool(after)), params)
+            rows = cur.fetchall()
+
+        with_addresses = bool(include) and "addresses" in include.split(",")
+        by_user: Dict[bytes, List[dict]] = defaultdict(list)
+        if rows and with_addresses:
+            # One IN(...) query for the whole page instead of one query
+            # per user on the client side.
+            placeholders = ",".join(["%s"] * len(rows))
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"SELECT {_ADDR_COLS} FROM addresses WHERE user_id IN ({placeholders})",
+                    [r[0] for r in rows]
+                )
+                for a in cur.fetchall():
+                    by_user[a[1]].append(addr_row_to_dict(a))
+
+        users = [
+            user_row_to_dict(r, by_user[r[0]] if with_addresses else None)
+            for r in rows
+        ]
+        next_cursor = make_cursor(rows[-1][7], rows[-1][0]) if len(rows) == limit else None
+        return users, next_cursor, etag
+    finally:
+        conn.close()
+
+@app.get("/users", response_model=List[UserWithAddresses], tags=["users"])
+async def list_users(
+    request: Request,
+    response: Response,
+    email: Optional[str] = Query(None),
+    username: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0, deprecated=True),
+    include: Optional[str] = Query(None, description="comma-separated; supports 'addresses'"),
+    after: Optional[str] = Query(None, description="keyset cursor: '<created_at iso>,<id>'")
+):
+    users, next_cursor, etag = await run_in_threadpool(
+        _sync_list_users, email, username, limit, offset, include, after,
+        request.headers.get("if-none-match")
+    )
+    headers = {"ETag": etag}
+    if users is None:
+        return Response(status_code=304, headers=headers)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(
+        orjson.dumps(users),
+        media_type="application/json",
+        headers=headers
+    )
+
+def _sync_get_user_by_email(email: str) -> UserRead:
+    conn = get_connection(readonly=True)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT {_USER_COLS} FROM users WHERE email = %s", (email,))
+            row = cur.fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail="User not found")
+            return row_to_user(row)
+    finally:
+        conn.close()
+
+@app.get("/users/by_email/{email}", response_model=UserRead, tags=["users"])
+async def get_user_by_email(email: str):
+    return await run_in_threadpool(_sync_get_user_by_email, email)
+
+@app.post(
+    "/users",
+    response_model=UserRead,
+    status_code=status.HTTP_201_CREATED,
+    tags=["users"]
+)
+async def create_user(payload: UserCreate, request: Request, response: Response):
+    user, created = await run_in_threadpool(_sync_create_user, payload)
+    status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
+
+    # RFC 7240: clients that don't need the echo back can skip body
+    # serialization entirely and follow Location with a (cached) GET.
+    if request.headers.get("prefer") == "return=minimal":
+        return Response(
+            status_code=status_code,
+            headers={
+                "Location": f"/users/{user.id}",
+                "Preference-Applied": "return=minimal"
+            }
+        )
+
+    response.status_code = status_code
+    response.headers["Location"] = f"/users/{user.id}"
+    return user
+
+def _sync_create_user(payload: UserCreate) -> tuple[UserRead, bool]:
+    user_id = uuid4()
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT {_USER_COLS} FROM users WHERE email = %s", (payload.email,))
+            existing_user = cur.fetchone()
+
+            if existing_user:
+                return row_to_user(existing_user), False
+
+            # Timestamps are set client-side so the response row can be
+            # built locally instead of re-SELECTing for server defaults.
+            # Timezone-aware UTC: MySQL converts the offset-qualified
+            # literal itself, so the value matches ON UPDATE
+            # CURRENT_TIMESTAMP regardless of the session time zone.
+            now = datetime.now(timezone.utc).replace(microsecond=0)
+            cur.execute(
+                """
+                INSERT INTO users
+                    (id, email, username, full_name, avatar_url, phone, role, created_at, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                (
+                    user_id.bytes,
+                    payload.email,
+                    payload.username,
+                    payload.full_name,
+                    payload.avatar_url,
+                    payload.phone,
+                    payload.role,
+                    now,
+                    now
+                )
+            )
+    finally:
+        conn.close()
+
+    return UserRead.model_construct(
+        id=user_id,
+        email=payload.email,
+        username=payload.username,
+        full_name=payload.full_name,
+        avatar_url=payload.avatar_url,
+        phone=payload.phone,
+        role=payload.role,
+        created_at=now,
+        updated_at=now
+    ), True
+
+def _sync_batch_create_users(payloads: List[UserCreate]) -> List[UserReadFast]:
+    # Aware UTC so the inserted TIMESTAMPs and the epoch-ms derived for
+    # the response agree regardless of host or session time zone.
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    now_ms = int(now.timestamp() * 1000)
+    ids = [uuid4() for _ in payloads]
+    rows = [
+        (
+            user_id.bytes,
+            p.email,
+            p.username,
+            p.full_name,
+            p.avatar_url,
+            p.phone,
+            p.role,
+            now,
+            now
+        )
+        for user_id, p in zip(ids, payloads)
+    ]
+
+    conn = get_connection()
+    try:
+        # One executemany in one explicit transaction: a single round-trip
+        # and a single commit instead of N POSTs.
+        with conn.cursor() as cur:
+            cur.execute("START TRANSACTION")
+            cur.executemany(
+                """
+                INSERT INTO users
+                    (id, email, username, full_name, avatar_url, phone, role, created_at, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                rows
+            )
+        conn.commit()
+    except mysql_driver.IntegrityError:
+        # Duplicate email/username (in the table or within the batch) is
+        # a client error, not a server fault: nothing was committed.
+        conn.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Batch contains an email or username that already exists"
+        )
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    # Every row shares one epoch-ms timestamp, so serialization formats
+    # the ISO string once for the whole batch (cached in the model).
+    return [
+        UserReadFast.model_construct(
+            id=user_id,
+            email=p.email,
+            username=p.username,
+            full_name=p.full_name,
+            avatar_url=p.avatar_url,
+            phone=p.phone,
+            role=p.role,
+            created_at_ms=now_ms,
+            updated_at_ms=now_ms
+        )
+        for user_id, p in zip(ids, payloads)
+    ]
+
+@app.post(
+    "/users:batch",
+    response_model=List[UserReadFast],
+    status_code=status.HTTP_201_CREATED,
+    tags=["users"]
+)
+async def batch_create_users(request: Request):
+    # Validate the raw body in one pydantic-core call instead of letting
+    # FastAPI loop over items in Python.
+    try:
+        payloads = USER_CREATE_LIST.validate_json(await request.body())
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=json.loads(e.json(include_url=False))
+        )
+    if not payloads:
+        return []
+    return await run_in_threadpool(_sync_batch_create_users, payloads)
+
+@app.get("/users/{user_id}", response_model=UserRead, tags=["users"])
+async def get_user(user_id: UUID, request: Request):
+    headers = user_link_headers(user_id)
+
+    cached = await cache_get(user_cache_key(user_id))
+    if cached is not None:
+        etag, body = cached
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag, **headers})
+        return Response(body, media_type="application/json", headers={"ETag": etag, **headers})
+
+    user = await run_in_threadpool(fetch_user_struct_by_id, user_id)
+    etag = make_user_etag(user)
+    body = JSON_ENCODER.encode(user).decode()
+    await cache_set(user_cache_key(user_id), etag, body)
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, **headers})
+
+    return Response(body, media_type="application/json", headers={"ETag": etag, **headers})
+
+def parse_user_etag_ts(etag: str) -> Optional[int]:
+    # make_user_etag format: W/"user-<uuid>-<epoch seconds>"
+    try:
+        return int(etag.rstrip('"').rpartition("-")[2])
+    except ValueError:
+        return None
+
+def _sync_replace_user(user_id: UUID, payload: UserUpdate, if_match: Optional[str]) -> UserRead:
+    fields = []
+    params: list[Any] = []
+
+    if payload.username is not None:
+        fields.append("username")
+        params.append(payload.username)
+    if payload.full_name is not None:
+        fields.append("full_name")
+        params.append(payload.full_name)
+    if payload.avatar_url is not None:
+        fields.append("avatar_url")
+        params.append(payload.avatar_url)
+    if payload.phone is not None:
+        fields.append("phone")
+        params.append(payload.phone)
+    if payload.role is not None:
+        fields.append("role")
+        params.append(payload.role)
+
+    conn = get_connection()
+    try:
+        if not fields:
+            current = fetch_user_by_id(user_id)
+            if if_match and if_match != make_user_etag(current):
+                raise HTTPException(status_code=412, detail="Precondition Failed (ETag mismatch)")
+            return current
+
+        # Fold the ETag precondition into the UPDATE itself instead of
+        # pre-fetching the row: one round-trip in the common case.
+        params.append(user_id.bytes)
+
+        expected_ts: Optional[int] = None
+        if if_match:
+            expected_ts = parse_user_etag_ts(if_match)
+            if expected_ts is None:
+                raise HTTPException(status_code=412, detail="Precondition Failed (ETag mismatch)")
+            params.append(expected_ts)
+
+        with conn.cursor() as cur:
+            cur.execute(_user_update_sql(tuple(fields), bool(if_match)), params)
+            if cur.rowcount == 0:
+                # Nothing matched: missing row, stale ETag, or a no-op
+                # update. One SELECT disambiguates.
+                cur.execute(
+                    "SELECT UNIX_TIMESTAMP(updated_at) ts FROM users WHERE id = %s",
+                    (user_id.bytes,)
+                )
+                row = cur.fetchone()
+                if not row:
+                    raise HTTPException(status_code=404, detail="User not found")
+                if expected_ts is not None and row[0] != expected_ts:
+                    raise HTTPException(status_code=412, detail="Precondition Failed (ETag mismatch)")
+    finally:
+        conn.close()
+
+    # Read-after-write must see the row just updated, so stay on the primary.
+    return fetch_user_by_id(user_id, readonly=False)
+
+@app.put("/users/{user_id}", response_model=UserRead, tags=["users"])
+async def replace_user(user_id: UUID, payload: UserUpdate, request: Request, response: Response):
+    updated = await run_in_threadpool(
+        _sync_replace_user, user_id, payload, request.headers.get("if-match")
+    )
+    await cache_delete(user_cache_key(user_id))
+    response.headers["ETag"] = make_user_etag(updated)
+    response.headers.update(user_link_headers(user_id))
+    return updated
+
+def _sync_delete_user(user_id: UUID) -> None:
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM users WHERE id = %s", (user_id.bytes,))
+            if cur.rowcount == 0:
+                raise HTTPException(status_code=404, detail="User not found")
+    finally:
+        conn.close()
+
+@app.delete(
+    "/users/{user_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    tags=["users"]
+)
+async def delete_user(user_id: UUID):
+    await run_in_threadpool(_sync_delete_user, user_id)
+    await cache_delete(user_cache_key(user_id))
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+def _sync_list_addresses(
+    user_id: Optional[UUID],
+    city: Optional[str],
+    postal_code: Optional[str],
+    limit: int,
+    offset: int,
+    after: Optional[str],
+    if_none_match: Optional[str]
+) -> tuple[Optional[List[dict]], Optional[str], str]:
+    conn = get_connection(readonly=True)
+    try:
+        filters: list[Any] = []
+        if user_id:
+            filters.append(user_id.bytes)
+        if city:
+            filters.append(f"%{city}%")
+        if postal_code:
+            filters.append(postal_code)
+
+        with conn.cursor() as cur:
+            cur.execute(_addresses_agg_sql(bool(user_id), bool(city), bool(postal_code)), filters)
+            agg = cur.fetchone()
+        etag = make_collection_etag("addresses", agg[0], agg[1])
+        if if_none_match and if_none_match == etag:
+            return None, None, etag
+
+        params = list(filters)
+        if after:
+            params.extend(parse_cursor(after))
+            params.append(limit)
+        else:
+            params.extend([limit, offset])
+
+        with conn.cursor() as cur:
+            cur.execute(
+                _list_addresses_sql(bool(user_id), bool(city), bool(postal_code), bool(after)),
+                params
+            )
+            rows = cur.fetchall()
+
+        addresses = [addr_row_to_dict(r) for r in rows]
+        next_cursor = make_cursor(rows[-1][6], rows[-1][0]) if len(rows) == limit else None
+        return addresses, next_cursor, etag
+    finally:
+        conn.close()
+
+@app.get("/addresses", response_model=List[Address], tags=["addresses"])
+async def list_addresses(
+    request: Request,
+    response: Response,
+    user_id: Optional[UUID] = Query(None),
+    city: Optional[str] = Query(None),
+    postal_code: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0, deprecated=True),
+    after: Optional[str] = Query(None, description="keyset cursor: '<created_at iso>,<id>'")
+):
+    addresses, next_cursor, etag = await run_in_threadpool(
+        _sync_list_addresses, user_id, city, postal_code, limit, offset, after,
+        request.headers.get("if-none-match")
+    )
+    headers = {"ETag": etag}
+    if addresses is None:
+        return Response(status_code=304, headers=headers)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(
+        orjson.dumps(addresses),
+        media_type="application/json",
+        headers=headers
+    )
+
+def _sync_create_address(payload: AddressCreate) -> Address:
+    addr_id = uuid4()
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO addresses
+                  (id, user_id, country, city, street, postal_code)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                """,
+                (
+                    addr_id.bytes,
+                    payload.user_id.bytes,
+                    payload.country,
+                    payload.city,
+                    payload.street,
+                    payload.postal_code
+                )
+            )
+    finally:
+        conn.close()
+
+    return Address.model_construct(
+        id=addr_id,
+        user_id=payload.user_id,
+        country=payload.country,
+        city=payload.city,
+        street=payload.street,
+        postal_code=payload.postal_code
+    )
+
+@app.post(
+    "/addresses",
+    response_model=Address,
+    status_code=status.HTTP_201_CREATED,
+    tags=["addresses"]
+)
+async def create_address(payload: AddressCreate, request: Request, response: Response):
+    addr = await run_in_threadpool(_sync_create_address, payload)
+
+    if request.headers.get("prefer") == "return=minimal":
+        return Response(
+            status_code=status.HTTP_201_CREATED,
+            headers={
+                "Location": f"/addresses/{addr.id}",
+                "Preference-Applied": "return=minimal"
+            }
+        )
+
+    response.headers["Location"] = f"/addresses/{addr.id}"
+    return addr
+
+def _sync_fetch_address_with_etag(address_id: UUID) -> tuple[AddressStruct, str]:
+    conn = get_connection(readonly=True)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"SELECT {_ADDR_COLS}, updated_at FROM addresses WHERE id = %s",
+                (address_id.bytes,)
+            )
+            row = cur.fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail="Address not found")
+            return row_to_address_struct(row), make_address_etag(address_id, row[6])
+    finally:
+        conn.close()
+
+def address_link_headers(address_id, user_id) -> dict[str, str]:
+    return {
+        "Link": (
+            f'</addresses/{address_id}>; rel="self", '
+            f'</addresses>; rel="collection", '
+            f'</users/{user_id}>; rel="user"'
+        )
+    }
+
+@app.get("/addresses/{address_id}", response_model=Address, tags=["addresses"])
+async def get_address(address_id: UUID, request: Request):
+    cached = await cache_get(address_cache_key(address_id))
+    if cached is not None:
+        etag, body = cached
+        user_id = json.loads(body)["user_id"]
+        headers = {"ETag": etag, **address_link_headers(address_id, user_id)}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    addr, etag = await run_in_threadpool(_sync_fetch_address_with_etag, address_id)
+    body = JSON_ENCODER.encode(addr).decode()
+    await cache_set(address_cache_key(address_id), etag, body)
+
+    headers = {"ETag": etag, **address_link_headers(address_id, addr.user_id)}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return Response(body, media_type="application/json", headers=headers)
+
+def _sync_replace_address(address_id: UUID, payload: AddressUpdate) -> Address:
+    conn = get_connection()
+    try:
+        fields = []
+        params: list[Any] = []
+
+        if payload.country is not None:
+            fields.append("country")
+            params.append(payload.country)
+        if payload.city is not None:
+            fields.append("city")
+            params.append(payload.city)
+        if payload.street is not None:
+            fields.append("street")
+            params.append(payload.street)
+        if payload.postal_code is not None:
+            fields.append("postal_code")
+            params.append(payload.postal_code)
+
+        if not fields:
+            return fetch_address_by_id(address_id)
+
+        params.append(address_id.bytes)
+
+        with conn.cursor() as cur:
+            cur.execute(_address_update_sql(tuple(fields)), params)
+            if cur.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Address not found")
+    finally:
+        conn.close()
+
+    return fetch_address_by_id(address_id)
+
+@app.put("/addresses/{address_id}", response_model=Address, tags=["addresses"])
+async def replace_address(address_id: UUID, payload: AddressUpdate):
+    addr = await run_in_threadpool(_sync_replace_address, address_id, payload)
+    await cache_delete(address_cache_key(address_id))
+    return addr
+
+def _sync_delete_address(address_id: UUID) -> None:
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM addresses WHERE id = %s", (address_id.bytes,))
+            if cur.rowcount == 0:
+                raise HTTPException(status_code=404, detail="Address not found")
+    finally:
+        conn.close()
+
+@app.delete(
+    "/addresses/{address_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    tags=["addresses"]
+)
+async def delete_address(address_id: UUID):
+    await run_in_threadpool(_sync_delete_address, address_id)
+    await cache_delete(address_cache_key(address_id))
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+# Job state lives in Redis (keyed job:<id>, 1h TTL) so any Uvicorn worker
+# can serve the poll, not just the one that created the job.
+JOB_TTL_SECONDS = 3600
+
+def job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+async def run_export_job(job_id: str, user_id: UUID):
+    r = get_redis()
+    await r.hset(job_key(job_id), "status", "running")
+    await asyncio.sleep(5)
+    await r.hset(
+        job_key(job_id),
+        mapping={
+            "status": "completed",
+            "result": json.dumps({"user_export_url": f"/users/{user_id}"})
+        }
+    )
+
+@app.post(
+    "/users/{user_id}/export",
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["users"]
+)
+async def start_export_user(
+    user_id: UUID,
+    background_tasks: BackgroundTasks
+):
+    job_id = str(uuid4())
+    r = get_redis()
+
+    async def _create_job():
+        await r.hset(job_key(job_id), mapping={"status": "pending"})
+        await r.expire(job_key(job_id), JOB_TTL_SECONDS)
+
+    # The existence check (MySQL) and the job-row creation (Redis) are
+    # independent I/O, so overlap them instead of paying both latencies
+    # back to back.
+    job_task = asyncio.create_task(_create_job())
+    try:
+        await asyncio.gather(run_in_threadpool(fetch_user_by_id, user_id), job_task)
+    except HTTPException:
+        # Unknown user: don't leave the just-created job row behind.
+        await asyncio.gather(job_task, return_exceptions=True)
+        await r.delete(job_key(job_id))
+        raise
+
+    background_tasks.add_task(run_export_job, job_id, user_id)
+
+    return ORJSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"job_id": job_id, "status": "pending"},
+        headers={"Location": f"/jobs/{job_id}"}
+    )
+
+@app.get("/jobs/{job_id}", tags=["jobs"])
+async def get_job_status(job_id: str):
+    job = await get_redis().hgetall(job_key(job_id))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if "result" in job:
+        job["result"] = json.loads(job["result"])
+    return job
+
+@app.get("/")
+def root():
+    return {"message": "Welcome to the User/Address API."}
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WORKERS", os.cpu_count())),
+        reload=False
+    )
@@ -0,0 +1,16 @@
+-- Composite indexes matching the filter + ORDER BY shapes of the list
+-- endpoints, so `ORDER BY created_at DESC LIMIT ...` becomes an index
+-- range scan instead of a full-table filesort.
+--
+-- Verify with e.g.:
+--   EXPLAIN SELECT id, email, username, full_name, avatar_url, phone, role,
+--                  created_at, updated_at
+--   FROM users ORDER BY created_at DESC LIMIT 50;
+
+-- list_users: no filter / email equality, ordered by created_at DESC
+CREATE INDEX ix_users_created ON users (created_at DESC, id);
+CREATE INDEX ix_users_email_created ON users (email, created_at DESC);
+
+-- list_addresses: user_id / postal_code equality, ordered by created_at DESC
+CREATE INDEX ix_addr_user_created ON addresses (user_id, created_at DESC);
+CREATE INDEX ix_addr_postal_created ON addresses (postal_code, created_at DESC);
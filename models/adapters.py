@@ -0,0 +1,11 @@
+# models/adapters.py
+from typing import List
+
+from pydantic import TypeAdapter
+
+from models.user import UserCreate
+
+# Built once at import: one validate_json call keeps the whole batch in
+# pydantic-core, and its string caching dedupes values repeated across
+# rows (same role, shared domains) instead of allocating per row.
+USER_CREATE_LIST = TypeAdapter(List[UserCreate])
@@ -0,0 +1,51 @@
+# models/structs.py
+from uuid import UUID
+from datetime import datetime
+
+import msgspec
+
+# msgspec Struct mirrors of the read DTOs. They are C-extension objects
+# with no __dict__ (gc=False: no cycles possible), so encoding a row for
+# a point read skips pydantic's Python-side model wrapper entirely.
+# Request parsing stays on the pydantic models, where validators fire.
+
+
+class UserReadStruct(msgspec.Struct, frozen=True, gc=False):
+    id: UUID
+    email: str
+    username: str
+    full_name: str | None
+    avatar_url: str | None
+    phone: str | None
+    role: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class AddressStruct(msgspec.Struct, frozen=True, gc=False):
+    id: UUID
+    user_id: UUID
+    country: str
+    city: str
+    street: str
+    postal_code: str | None
+
+
+# One encoder shared by every handler; msgspec caches its per-type
+# encode plans internally.
+JSON_ENCODER = msgspec.json.Encoder()
+
+
+def row_to_user_struct(row: tuple) -> UserReadStruct:
+    """Build a UserReadStruct from a row in _USER_COLS order."""
+    return UserReadStruct(
+        UUID(bytes=row[0]), row[1], row[2], row[3], row[4],
+        row[5], row[6], row[7], row[8]
+    )
+
+
+def row_to_address_struct(row: tuple) -> AddressStruct:
+    """Build an AddressStruct from a row in _ADDR_COLS order."""
+    return AddressStruct(
+        UUID(bytes=row[0]), UUID(bytes=row[1]), row[2], row[3], row[4], row[5]
+    )
@@ -1,93 +1,216 @@
-# models/user.py
-from uuid import UUID
-from typing import Optional, Literal
-from datetime import datetime
-from pydantic import BaseModel, Field, EmailStr, HttpUrl
-
-
-class UserBrief(BaseModel):
-    id: UUID = Field(..., description="User ID (UUID)")
-    username: str = Field(..., min_length=3, max_length=30, description="username")
-    avatar_url: Optional[HttpUrl] = Field(None, description="avatar URL")
-    role: Literal["user", "admin"] = Field(..., description="Role of the user (user or admin)")
-
-    model_config = {
-        "json_schema_extra": {
-            "example": {
-                "id": "6f3e3c14-1e1d-46fd-9a77-7d6d85b3d2c3",
-                "username": "alice_shop",
-                "avatar_url": "https://cdn.example.com/avatars/alice.png",
-                "role": "user"
-            }
-        }
-    }
-
-
-class UserRead(BaseModel):
-    id: UUID = Field(..., description="User ID (UUID)")
-    email: EmailStr = Field(..., description="email address")
-    username: str = Field(..., min_length=3, max_length=30, description="username")
-    full_name: Optional[str] = Field(None, min_length=1, max_length=50, description="full name")
-    avatar_url: Optional[HttpUrl] = Field(None, description="avatar URL")
-    phone: Optional[str] = Field(None, min_length=6, max_length=30, description="phone number")
-    role: Literal["user", "admin"] = Field(..., description="Role of the user (user or admin)")
-    created_at: datetime = Field(..., description="created time")
-    updated_at: datetime = Field(..., description="updated time")
-
-    model_config = {
-        "json_schema_extra": {
-            "example": {
-                "id": "6f3e3c14-1e1d-46fd-9a77-7d6d85b3d2c3",
-                "email": "alice@example.com",
-                "username": "alice_shop",
-                "full_name": "Alice Zhou",
-                "avatar_url": "https://cdn.example.com/avatars/alice.png",
-                "phone": "+1-215-000-0000",
-                "role": "admin",
-                "created_at": "2025-10-17T12:00:00Z",
-                "updated_at": "2025-10-17T12:10:00Z"
-            }
-        }
-    }
-
-
-class UserCreate(BaseModel):
-    email: EmailStr = Field(..., description="email address")
-    username: str = Field(..., min_length=3, max_length=30, description="username")
-    full_name: Optional[str] = Field(None, min_length=1, max_length=50, description="full name")
-    avatar_url: Optional[HttpUrl] = Field(None, description="avatar URL")
-    phone: Optional[str] = Field(None, min_length=6, max_length=30, description="phone number")
-    role: Literal["user", "admin"] = Field("user", description="Role of the user (default: user)")
-
-    model_config = {
-        "json_schema_extra": {
-            "example": {
-                "email": "alice@example.com",
-                "username": "alice_shop",
-                "full_name": "Alice Zhou",
-                "avatar_url": "https://cdn.example.com/avatars/alice.png",
-                "phone": "+1-215-000-0000",
-                "role": "user"
-            }
-        }
-    }
-
-
-class UserUpdate(BaseModel):
-    username: Optional[str] = Field(None, min_length=3, max_length=30, description="username")
-    full_name: Optional[str] = Field(None, min_length=1, max_length=50, description="full name")
-    avatar_url: Optional[HttpUrl] = Field(None, description="avatar URL")
-    phone: Optional[str] = Field(None, min_length=6, max_length=30, description="phone number")
-    role: Optional[Literal["user", "admin"]] = Field(None, description="Role of the user (user or admin)")
-
-    model_config = {
-        "json_schema_extra": {
-            "example": {
-                "username": "alice_updated",
-                "full_name": "Alice Z.",
-                "avatar_url": "https://cdn.example.com/avatars/alice-new.png",
-                "phone": "+1-215-000-0000",
-                "role": "admin"
-            }
-        }
-    }
+# models/user.py
+import time
+from uuid import UUID
+from typing import Annotated, Any, List, Literal
+from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from pydantic import BaseModel, Field, field_validator, model_serializer, model_validator
+
+from models.address import BASE_CONFIG, Address, RawId, UuidField, schema_example
+from models.validators import is_valid_email
+
+# Shared Annotated aliases: every model that uses one of these carries
+# pointer-identical field metadata, which lets pydantic-core's schema
+# cache reuse the compiled validator instead of rebuilding it per class.
+Email = Annotated[str, Field(max_length=254, description="email address")]
+# Anchored pattern checks length and printable-ASCII charset in one pass
+# of pydantic-core's Rust regex engine (a DFA, no backtracking), so the
+# separate min/max length gates are unnecessary.
+Username = Annotated[str, Field(pattern=r"^[\x20-\x7E]{3,30}$", description="username")]
+FullName = Annotated[str, Field(min_length=1, max_length=50, description="full name")]
+AvatarUrl = Annotated[str, Field(max_length=2048, description="avatar URL")]
+Phone = Annotated[str, Field(min_length=6, max_length=30, description="phone number")]
+Role = Annotated[Literal["user", "admin"], Field(description="Role of the user (user or admin)")]
+
+# Example payloads are hoisted to module level and shared by reference so
+# each class body doesn't rebuild its own copy at import time. They are
+# frozen so schema generation can share them by identity instead of
+# taking defensive copies.
+_USER_EXAMPLE = MappingProxyType({
+    "id": "6f3e3c14-1e1d-46fd-9a77-7d6d85b3d2c3",
+    "email": "alice@example.com",
+    "username": "alice_shop",
+    "full_name": "Alice Zhou",
+    "avatar_url": "https://cdn.example.com/avatars/alice.png",
+    "phone": "+1-215-000-0000",
+    "role": "admin",
+    "created_at": "2025-10-17T12:00:00Z",
+    "updated_at": "2025-10-17T12:10:00Z"
+})
+
+_USER_BRIEF_EXAMPLE = MappingProxyType({
+    **{k: _USER_EXAMPLE[k] for k in ("id", "username", "avatar_url")},
+    "role": "user"
+})
+
+_USER_CREATE_EXAMPLE = MappingProxyType({
+    **{k: _USER_EXAMPLE[k] for k in ("email", "username", "full_name", "avatar_url", "phone")},
+    "role": "user"
+})
+
+_USER_UPDATE_EXAMPLE = MappingProxyType({
+    "username": "alice_updated",
+    "full_name": "Alice Z.",
+    "avatar_url": "https://cdn.example.com/avatars/alice-new.png",
+    "phone": _USER_EXAMPLE["phone"],
+    "role": "admin"
+})
+
+_USER_CONFIG = BASE_CONFIG | {
+    "json_schema_extra": schema_example(_USER_EXAMPLE),
+    # Read-only DTO: frozen skips validate-on-assign bookkeeping and
+    # extra="forbid" collapses the extra-field branch.
+    "frozen": True,
+    "extra": "forbid",
+}
+_USER_BRIEF_CONFIG = BASE_CONFIG | {
+    "json_schema_extra": schema_example(_USER_BRIEF_EXAMPLE),
+    "frozen": True,
+    "extra": "forbid",
+    # Rarely instantiated; build its validator on first use instead of
+    # at import.
+    "defer_build": True,
+}
+_USER_CREATE_CONFIG = BASE_CONFIG | {
+    "json_schema_extra": schema_example(_USER_CREATE_EXAMPLE),
+    "extra": "forbid",
+}
+_USER_UPDATE_CONFIG = BASE_CONFIG | {
+    "json_schema_extra": schema_example(_USER_UPDATE_EXAMPLE),
+    "defer_build": True,
+}
+
+
+class _UserFields(BaseModel):
+    """Optional profile fields shared by the user read/write models."""
+    full_name: FullName | None = None
+    avatar_url: AvatarUrl | None = None
+    phone: Phone | None = None
+
+
+class UserBrief(BaseModel):
+    id: UuidField = Field(..., description="User ID (UUID)")
+    username: Username
+    avatar_url: AvatarUrl | None = None
+    role: Role
+
+    model_config = _USER_BRIEF_CONFIG
+
+
+class UserRead(_UserFields):
+    id: UuidField = Field(..., description="User ID (UUID)")
+    email: Email
+    username: Username
+    role: Role
+    created_at: datetime = Field(..., description="created time")
+    updated_at: datetime = Field(..., description="updated time")
+
+    model_config = _USER_CONFIG
+
+
+class UserWithAddresses(UserRead):
+    addresses: List[Address] | None = Field(
+        None, description="addresses of the user (only when ?include=addresses)"
+    )
+
+
+class UserCreate(_UserFields):
+    email: Email
+    username: Username
+    role: Role = "user"
+
+    model_config = _USER_CREATE_CONFIG
+
+    @field_validator("email", mode="after")
+    @classmethod
+    def _validate_email(cls, v: str) -> str:
+        # Writes get the full (cached) check; read models trust the DB.
+        if not is_valid_email(v):
+            raise ValueError("value is not a valid email address")
+        return v
+
+
+@lru_cache(maxsize=1024)
+def _fmt_epoch_ms(ms: int) -> str:
+    # Batch rows share their insert timestamp, so the formatted string
+    # is computed once per distinct second, not once per row.
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ms // 1000))
+
+
+class UserReadFast(BaseModel):
+    """UserRead variant holding timestamps as epoch-ms ints.
+
+    Skips pydantic's datetime validator/serializer per field; the wire
+    format is unchanged — ISO-8601 is accepted on input and emitted on
+    output, formatted through a cached module-level helper.
+    """
+    id: UuidField
+    email: Email
+    username: Username
+    full_name: FullName | None = None
+    avatar_url: AvatarUrl | None = None
+    phone: Phone | None = None
+    role: Role
+    created_at_ms: int
+    updated_at_ms: int
+
+    @model_validator(mode="before")
+    @classmethod
+    def _iso_to_ms(cls, data: Any) -> Any:
+        if isinstance(data, dict):
+            for key in ("created_at", "updated_at"):
+                v = data.pop(key, None)
+                if v is not None:
+                    if isinstance(v, str):
+                        v = datetime.fromisoformat(v)
+                    data[f"{key}_ms"] = int(v.timestamp() * 1000)
+        return data
+
+    @model_serializer(mode="plain")
+    def _to_wire(self) -> dict:
+        return {
+            "id": self.id,
+            "email": self.email,
+            "username": self.username,
+            "full_name": self.full_name,
+            "avatar_url": self.avatar_url,
+            "phone": self.phone,
+            "role": self.role,
+            "created_at": _fmt_epoch_ms(self.created_at_ms),
+            "updated_at": _fmt_epoch_ms(self.updated_at_ms)
+        }
+
+
+class UserRaw(_UserFields):
+    """User row with the id kept as the DB's raw 16 bytes.
+
+    Skips UUID object construction during bulk ingest; call to_api()
+    only when a single row actually needs a JSON-facing UUID.
+    """
+    id: RawId
+    email: Email
+    username: Username
+    role: Role
+    created_at: datetime
+    updated_at: datetime
+
+    def to_api(self) -> "UserRead":
+        return UserRead.model_construct(
+            id=UUID(bytes=self.id),
+            email=self.email,
+            username=self.username,
+            full_name=self.full_name,
+            avatar_url=self.avatar_url,
+            phone=self.phone,
+            role=self.role,
+            created_at=self.created_at,
+            updated_at=self.updated_at
+        )
+
+
+class UserUpdate(_UserFields):
+    username: Username | None = None
+    role: Role | None = None
+
+    model_config = _USER_UPDATE_CONFIG
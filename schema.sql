@@ -1,5 +1,5 @@
 CREATE TABLE IF NOT EXISTS users (
-  id           CHAR(36)     NOT NULL PRIMARY KEY DEFAULT (UUID()),
+  id           BINARY(16)   NOT NULL PRIMARY KEY DEFAULT (UUID_TO_BIN(UUID())),
   email        VARCHAR(255) NOT NULL UNIQUE,
   username     VARCHAR(30)  NOT NULL UNIQUE,
   full_name    VARCHAR(50),
@@ -15,8 +15,8 @@ CREATE TABLE IF NOT EXISTS users (
   COLLATE=utf8mb4_0900_ai_ci;
 
 CREATE TABLE IF NOT EXISTS addresses (
-  id           CHAR(36)     NOT NULL PRIMARY KEY DEFAULT (UUID()),
-  user_id      CHAR(36)     NOT NULL,
+  id           BINARY(16)   NOT NULL PRIMARY KEY DEFAULT (UUID_TO_BIN(UUID())),
+  user_id      BINARY(16)   NOT NULL,
 
   country      VARCHAR(60)  NOT NULL,
   city         VARCHAR(60)  NOT NULL,
@@ -38,3 +38,10 @@ CREATE TABLE IF NOT EXISTS addresses (
 CREATE INDEX idx_addresses_user_id ON addresses (user_id);
 CREATE INDEX idx_addresses_city ON addresses (city);
 CREATE INDEX idx_addresses_postal_code ON addresses (postal_code);
+
+-- Composite indexes matching the list endpoints' filter + ORDER BY shapes
+-- (see migrations/001_list_query_indexes.sql).
+CREATE INDEX ix_users_created ON users (created_at DESC, id);
+CREATE INDEX ix_users_email_created ON users (email, created_at DESC);
+CREATE INDEX ix_addr_user_created ON addresses (user_id, created_at DESC);
+CREATE INDEX ix_addr_postal_created ON addresses (postal_code, created_at DESC);